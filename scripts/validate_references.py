@@ -2,81 +2,386 @@
 """
 Validate DOIs and URLs from BibTeX references.
 This script checks if DOIs resolve correctly using Crossref API and URLs return valid responses.
-Results are logged to log.txt with timestamps.
+Requests are issued concurrently with asyncio and aiohttp.
+Results are logged to log.txt with timestamps and cached in validation_cache.jsonl.
 
-Usage: uv run validate_references.py
+Usage: uv run validate_references.py [--validator {crossref,head}]
+Set CROSSREF_MAILTO=you@example.org to use Crossref's polite pool.
 """
 
-import re
+import argparse
+import asyncio
+import json
+import os
 import sys
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
 from pathlib import Path
+from urllib.parse import urlsplit
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import aiohttp
+import bibtexparser
 
+try:
+    import orjson
 
-def setup_session():
-    """Set up a requests session with retry strategy."""
-    session = requests.Session()
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-    )
+# Worker threads for decoding API responses off the event loop, so a burst of
+# concurrent replies does not stall in-flight requests
+_parse_executor = ThreadPoolExecutor(max_workers=8)
+
+# Contact email for Crossref's "polite" pool, which has higher rate limits
+CROSSREF_MAILTO = os.environ.get("CROSSREF_MAILTO", "").strip()
+
+# Maximum number of validations in flight at once; the polite pool can take more
+CONCURRENCY = 50 if CROSSREF_MAILTO else 20
+
+# Transient statuses worth retrying, mirroring the old urllib3 Retry policy;
+# like urllib3, a Retry-After header is honoured on 413, 429 and 503
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_AFTER_STATUSES = (413, 429, 503)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 1
+
+# Per-host request spacing learned from X-Rate-Limit-* response headers, and
+# the earliest monotonic time each host may be contacted again
+_host_delay = {}
+_next_allowed = {}
+
+# DOIs per Crossref filter query; the API OR-combines repeated doi: filters
+CROSSREF_BATCH_SIZE = 50
 
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+# Common DataCite registrant prefixes (Zenodo, Dryad, figshare, OSTI), looked up
+# in DataCite's API for a title when Crossref has no record. Not exhaustive:
+# arXiv, OSF, mEDRA, JaLC and other agencies' DOIs are confirmed via doi.org
+_DATACITE_PREFIXES = ("10.5281/", "10.5061/", "10.6084/", "10.2172/")
+
+CROSSREF_NOT_FOUND = "DOI not found in Crossref database"
+
+# Append-only JSONL cache of validation results, reused for 30 days
+CACHE_FILE = Path("validation_cache.jsonl")
+CACHE_TTL = 30 * 24 * 60 * 60
+
+
+def setup_session():
+    """Set up an aiohttp session with a pooled, keep-alive connector."""
+    # Allow every in-flight validation its own socket to the same host and keep
+    # idle sockets around long enough to be reused instead of re-handshaking TLS
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=CONCURRENCY,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+    )
 
     # Set user agent to avoid blocking
-    session.headers.update(
-        {"User-Agent": "Mozilla/5.0 (compatible; Reference Validator/1.0)"}
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30),
+        headers={
+            "User-Agent": "Mozilla/5.0 (compatible; Reference Validator/1.0)",
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip",
+        },
     )
 
-    return session
 
+def crossref_params(params):
+    """Add the polite-pool mailto to Crossref query params when configured.
 
-def parse_bib_file(file_path):
-    """Parse BibTeX file and extract DOIs and URLs."""
-    with open(file_path, "r", encoding="utf-8") as file:
-        content = file.read()
+    The contact address is only ever sent to Crossref, never to publishers.
+    """
+    if CROSSREF_MAILTO:
+        return {**params, "mailto": CROSSREF_MAILTO}
+    return params
 
-    # Extract entry keys (citation keys)
-    entry_pattern = r"@\w+\{([^,]+),"
-    entries = re.findall(entry_pattern, content)
 
-    # Extract DOIs
-    doi_pattern = r"doi\s*=\s*\{([^}]+)\}"
-    dois = re.findall(doi_pattern, content)
+def parse_rate_limit(headers):
+    """Return seconds between requests advertised by X-Rate-Limit-* headers."""
+    limit = headers.get("X-Rate-Limit-Limit")
+    interval = headers.get("X-Rate-Limit-Interval")
+    if not limit or not interval:
+        return None
 
-    # Extract URLs
-    url_pattern = r"url\s*=\s*\{([^}]+)\}"
-    urls = re.findall(url_pattern, content)
+    try:
+        # Crossref reports the interval as e.g. "1s"
+        seconds = float(interval.strip().rstrip("s"))
+        requests_per_interval = int(limit)
+    except ValueError:
+        return None
+
+    if requests_per_interval <= 0:
+        return None
+    return seconds / requests_per_interval
+
+
+async def throttle(host):
+    """Wait until host may be contacted again, reserving the next slot."""
+    now = time.monotonic()
+    start = max(now, _next_allowed.get(host, now))
+    # Reserve before sleeping so concurrent callers queue up behind this one
+    _next_allowed[host] = start + _host_delay.get(host, 0)
+    if start > now:
+        await asyncio.sleep(start - now)
+
+
+def parse_retry_after(headers):
+    """Return seconds to wait from a Retry-After header, or None if absent."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    # Either delay-seconds or an HTTP date
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+async def request_with_retry(session, method, url, timeout, read_body=True, **kwargs):
+    """Send a request, retrying transient failures with exponential backoff.
+
+    Connection errors, timeouts and RETRY_STATUSES responses share one budget
+    of MAX_RETRIES retries; the last connection error or timeout is re-raised.
+    Returns (status, headers, body). With read_body=False the body is never
+    downloaded and the connection is dropped on release.
+    """
+    host = urlsplit(url).hostname
+    for attempt in range(MAX_RETRIES + 1):
+        await throttle(host)
+        backoff = BACKOFF_FACTOR * 2**attempt
+        try:
+            async with session.request(
+                method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+            ) as response:
+                delay = parse_rate_limit(response.headers)
+                if delay is not None:
+                    _host_delay[host] = delay
+                if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    body = await response.read() if read_body else b""
+                    return response.status, response.headers, body
+                if response.status in RETRY_AFTER_STATUSES:
+                    retry_after = parse_retry_after(response.headers)
+                    if retry_after is not None:
+                        backoff = retry_after
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
+        await asyncio.sleep(backoff)
+
+
+def split_concatenation(value):
+    """Split a raw BibTeX value on top-level # operators."""
+    parts = []
+    current = []
+    depth = 0
+    in_quotes = False
+    for char in value:
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif char == '"' and depth == 0:
+            in_quotes = not in_quotes
+        elif char == "#" and depth == 0 and not in_quotes:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current).strip())
+    return parts
+
+
+def resolve_value(value, strings):
+    """Resolve a raw BibTeX value: enclosing braces/quotes, @string macros and #."""
+    resolved = []
+    for part in split_concatenation(value):
+        if len(part) >= 2 and (part[0], part[-1]) in (("{", "}"), ('"', '"')):
+            resolved.append(part[1:-1])
+        else:
+            # Bare word: a (case-insensitive) @string macro, or a number
+            resolved.append(strings.get(part.lower(), part))
+    return "".join(resolved)
 
-    return entries, dois, urls
+
+def parse_bib_file(file_path):
+    """Parse BibTeX file and extract DOIs and URLs.
+
+    Returns (entries, dois, urls, warnings); warnings describe blocks that
+    could not be parsed, so their references are not silently skipped.
+    """
+    # Take raw values and resolve them here: bibtexparser's default stack does
+    # not handle # concatenation
+    library = bibtexparser.parse_file(str(file_path), parse_stack=[])
+
+    # Later @string definitions may build on earlier ones
+    strings = {}
+    for string in library.strings:
+        strings[string.key.lower()] = resolve_value(string.value, strings)
+
+    parsed_entries = list(library.entries)
+    warnings = []
+    for block in library.failed_blocks:
+        line = block.start_line + 1
+        if not isinstance(block, bibtexparser.model.DuplicateBlockKeyBlock):
+            warnings.append(
+                f"Could not parse entry on line {line}; its references are skipped"
+            )
+        elif isinstance(block.ignore_error_block, bibtexparser.model.Entry):
+            # The duplicate is still a complete entry; validate its references
+            parsed_entries.append(block.ignore_error_block)
+            warnings.append(f"Duplicate entry key '{block.key}' on line {line}")
+        else:
+            # Repeated @string definitions are common in merged files; the
+            # first definition is the one used
+            warnings.append(
+                f"Duplicate @string '{block.key}' on line {line}; first definition used"
+            )
+
+    entries = []
+    dois = []
+    urls = []
+    for entry in parsed_entries:
+        entries.append(entry.key)
+        # Field names are case-insensitive in BibTeX (doi, DOI, Doi)
+        fields = {
+            field.key.lower(): resolve_value(field.value, strings)
+            for field in entry.fields
+        }
+        if fields.get("doi"):
+            # Braces inside a DOI only protect case and are not part of it
+            dois.append(fields["doi"].replace("{", "").replace("}", ""))
+        if fields.get("url"):
+            urls.append(fields["url"])
+
+    return entries, dois, urls, warnings
 
 
 def validate_doi_format(doi):
-    """Validate DOI format using regex."""
+    """Validate DOI format (10.xxxx/xxxxx) with plain string checks."""
     if not doi:
         return False, "Empty DOI"
 
     # Clean DOI
     doi = doi.strip()
 
-    # DOI format: 10.xxxx/xxxxx
-    doi_pattern = r"^10\.\d{4,}/[^\s]+$"
-    if re.match(doi_pattern, doi):
-        return True, "Valid DOI format"
-    else:
+    # DOI format: "10." plus at least four digits, "/", then a non-blank suffix
+    registrant, _, suffix = doi.partition("/")
+    if (
+        not registrant.startswith("10.")
+        or len(registrant) < 7
+        or not registrant[3:].isdecimal()
+        or suffix.split() != [suffix]
+    ):
         return False, "Invalid DOI format"
+    return True, "Valid DOI format"
+
+
+async def run_parser(func, *args):
+    """Run a response-parsing function in the parser thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_parse_executor, func, *args)
 
 
-def validate_doi_crossref(session, doi):
+def crossref_title_message(work):
+    """Build the success message for a Crossref work record."""
+    titles = work.get("title")
+    if titles:
+        return f"Valid DOI - {titles[0][:60]}..."
+    return "Valid DOI (no title available)"
+
+
+def index_crossref_items(body):
+    """Decode a Crossref list response into work records keyed by DOI."""
+    items = _json_loads(body)["message"]["items"]
+    return {item["DOI"].lower(): item for item in items}
+
+
+def crossref_work_result(body, filtered):
+    """Decode a Crossref response for a single DOI into (success, message)."""
+    message = _json_loads(body).get("message", {})
+    if not filtered:
+        return True, crossref_title_message(message)
+    items = message.get("items")
+    if not items:
+        return False, CROSSREF_NOT_FOUND
+    return True, crossref_title_message(items[0])
+
+
+def datacite_work_result(body):
+    """Decode a DataCite DOI record into (success, message)."""
+    titles = _json_loads(body)["data"]["attributes"].get("titles")
+    if titles:
+        return True, f"Valid DOI (DataCite) - {titles[0]['title'][:60]}..."
+    return True, "Valid DOI (DataCite, no title available)"
+
+
+async def lookup_crossref_batch(session, dois):
+    """Look up several DOIs with one Crossref filter query.
+
+    Returns a dict mapping each found (lower-cased) DOI to its work record, or
+    None if the query itself failed.
+    """
+    params = crossref_params(
+        {
+            "filter": ",".join(f"doi:{doi}" for doi in dois),
+            "rows": "1000",
+            "select": "DOI,title",
+        }
+    )
+
+    try:
+        status, _, body = await request_with_retry(
+            session, "GET", "https://api.crossref.org/works", 30, params=params
+        )
+        if status != 200:
+            return None
+        return await run_parser(index_crossref_items, body)
+    except Exception:
+        return None
+
+
+async def lookup_crossref(sem, session, dois):
+    """Look up DOIs in Crossref in batches of CROSSREF_BATCH_SIZE.
+
+    Returns (found, checked): work records keyed by DOI, and the set of DOIs
+    whose batch query succeeded. DOIs in failed batches are in neither.
+    """
+    # Commas would split the filter and malformed DOIs can fail a whole batch
+    batchable = [doi for doi in dois if "," not in doi and validate_doi_format(doi)[0]]
+    chunks = [
+        batchable[i : i + CROSSREF_BATCH_SIZE]
+        for i in range(0, len(batchable), CROSSREF_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(
+        *(bounded(sem, lookup_crossref_batch, session, chunk) for chunk in chunks)
+    )
+
+    found = {}
+    checked = set()
+    for chunk, works in zip(chunks, results):
+        if works is None:
+            continue
+        found.update(works)
+        checked.update(chunk)
+
+    return found, checked
+
+
+async def validate_doi_crossref(session, doi):
     """Validate DOI using Crossref API."""
     if not doi:
         return False, "Empty DOI"
@@ -89,59 +394,129 @@ def validate_doi_crossref(session, doi):
     if not format_valid:
         return False, format_msg
 
-    # Check with Crossref API
-    crossref_url = f"https://api.crossref.org/works/{doi}"
+    # Check with Crossref API, asking only for the fields we report. The
+    # single-work route has no select, so use a one-DOI filter query unless a
+    # comma in the DOI would split the filter
+    filtered = "," not in doi
+    if filtered:
+        crossref_url = "https://api.crossref.org/works"
+        params = crossref_params({"filter": f"doi:{doi}", "select": "DOI,title"})
+    else:
+        crossref_url = f"https://api.crossref.org/works/{doi}"
+        params = crossref_params({})
 
     try:
-        response = session.get(crossref_url, timeout=15)
-        if response.status_code == 200:
-            data = response.json()
-            if "message" in data and "title" in data["message"]:
-                title = data["message"]["title"][0][:60]
-                return True, f"Valid DOI - {title}..."
-            else:
-                return True, "Valid DOI (no title available)"
-        elif response.status_code == 404:
-            return False, "DOI not found in Crossref database"
+        status, _, body = await request_with_retry(
+            session, "GET", crossref_url, 15, params=params
+        )
+        if status == 200:
+            return await run_parser(crossref_work_result, body, filtered)
+        elif status == 404:
+            return False, CROSSREF_NOT_FOUND
         else:
-            return False, f"Crossref API error (status: {response.status_code})"
-    except requests.exceptions.Timeout:
+            return False, f"Crossref API error (status: {status})"
+    except asyncio.TimeoutError:
         return False, "Crossref API timeout"
-    except requests.exceptions.ConnectionError:
+    except aiohttp.ClientConnectionError:
         return False, "Crossref API connection error"
     except Exception as e:
         return False, f"Crossref validation error: {str(e)}"
 
 
-def validate_doi(session, doi):
-    """Validate DOI using Crossref API with fallback to direct resolution."""
+async def validate_doi_datacite(session, doi):
+    """Validate DOI using DataCite API."""
+    datacite_url = f"https://api.datacite.org/dois/{doi.strip()}"
+
+    try:
+        status, _, body = await request_with_retry(session, "GET", datacite_url, 15)
+        if status == 200:
+            return await run_parser(datacite_work_result, body)
+        elif status == 404:
+            return False, "DOI not found in DataCite database"
+        else:
+            return False, f"DataCite API error (status: {status})"
+    except asyncio.TimeoutError:
+        return False, "DataCite API timeout"
+    except aiohttp.ClientConnectionError:
+        return False, "DataCite API connection error"
+    except Exception as e:
+        return False, f"DataCite validation error: {str(e)}"
+
+
+async def validate_doi_not_in_crossref(session, doi):
+    """Validate a DOI that Crossref has no record of.
+
+    Crossref only holds DOIs it registered, so a miss is not final: known
+    DataCite prefixes are tried in DataCite's API, and anything still unknown
+    gets a single no-redirect HEAD to doi.org, which covers every agency.
+    """
+    if doi.strip().lower().startswith(_DATACITE_PREFIXES):
+        success, message = await validate_doi_datacite(session, doi)
+        if success:
+            return success, message
+
+    return await validate_doi_direct(session, doi)
+
+
+async def validate_doi(session, doi):
+    """Validate DOI using Crossref API with fallback to DataCite or doi.org."""
     # Try Crossref API first (more reliable)
-    success, message = validate_doi_crossref(session, doi)
+    success, message = await validate_doi_crossref(session, doi)
     if success:
         return success, message
 
-    # Fallback to direct DOI resolution if Crossref fails
-    if not doi:
-        return False, "Empty DOI"
+    if message == CROSSREF_NOT_FOUND:
+        return await validate_doi_not_in_crossref(session, doi)
+
+    # Crossref gave no answer (bad format or API failure); a malformed DOI
+    # cannot resolve anywhere, otherwise fall back to direct resolution
+    if not validate_doi_format(doi)[0]:
+        return success, message
+    return await validate_doi_direct(session, doi)
+
+
+async def validate_doi_batched(session, doi, found, checked):
+    """Validate DOI using prefetched Crossref batch results."""
+    if doi in found:
+        return True, crossref_title_message(found[doi])
+    if doi in checked:
+        # Crossref already answered "missing" for this DOI
+        return await validate_doi_not_in_crossref(session, doi)
+    return await validate_doi(session, doi)
+
+
+async def validate_doi_direct(session, doi):
+    """Validate DOI by resolving it through doi.org."""
+    # Reject malformed DOIs locally, as the Crossref path does
+    format_valid, format_msg = validate_doi_format(doi)
+    if not format_valid:
+        return False, format_msg
 
     doi = doi.strip()
     doi_url = f"https://doi.org/{doi}"
 
     try:
-        response = session.head(doi_url, timeout=60, allow_redirects=True)
-        if response.status_code == 200:
-            return True, f"DOI resolves directly (status: {response.status_code})"
+        # The first redirect from doi.org already proves the DOI is registered;
+        # following it to the publisher only invites 403/405s on HEAD
+        status, headers, _ = await request_with_retry(
+            session, "HEAD", doi_url, 10, allow_redirects=False
+        )
+        if 300 <= status < 400:
+            location = headers.get("Location", "unknown target")
+            return True, f"DOI resolves directly (status: {status}) -> {location}"
+        elif status == 200:
+            return True, f"DOI resolves directly (status: {status})"
         else:
-            return False, f"DOI failed with status: {response.status_code}"
-    except requests.exceptions.Timeout:
+            return False, f"DOI failed with status: {status}"
+    except asyncio.TimeoutError:
         return False, "DOI validation timed out"
-    except requests.exceptions.ConnectionError:
+    except aiohttp.ClientConnectionError:
         return False, "DOI connection error"
     except Exception as e:
         return False, f"DOI validation error: {str(e)}"
 
 
-def validate_url(session, url):
+async def validate_url(session, url):
     """Validate a URL by checking if it returns a valid response."""
     if not url:
         return False, "Empty URL"
@@ -150,107 +525,222 @@ def validate_url(session, url):
     url = url.strip()
 
     try:
-        response = session.head(url, timeout=10, allow_redirects=True)
-        if response.status_code == 200:
-            return True, f"URL accessible (status: {response.status_code})"
+        status, _, _ = await request_with_retry(session, "HEAD", url, 10)
+        if status in (403, 405):
+            # Many publishers refuse HEAD; retry as a GET without reading the body
+            status, _, _ = await request_with_retry(
+                session, "GET", url, 10, read_body=False
+            )
+        if status == 200:
+            return True, f"URL accessible (status: {status})"
         else:
-            return False, f"URL failed with status: {response.status_code}"
-    except requests.exceptions.Timeout:
+            return False, f"URL failed with status: {status}"
+    except asyncio.TimeoutError:
         return False, "URL validation timed out"
-    except requests.exceptions.ConnectionError:
+    except aiohttp.ClientConnectionError:
         return False, "URL connection error"
     except Exception as e:
         return False, f"URL validation error: {str(e)}"
 
 
-def log_result(log_file, message):
-    """Log a message with timestamp."""
+def cache_key(kind, value, validator="crossref"):
+    """Build the cache key for a result; DOI answers depend on the validator."""
+    if kind == "doi" and validator != "crossref":
+        return f"{kind}:{validator}:{value}"
+    return f"{kind}:{value}"
+
+
+def cached_result(cache, key):
+    """Return the cache entry for key if it is still fresh, else None."""
+    entry = cache.get(key)
+    if entry and entry["ts"] > time.time() - CACHE_TTL:
+        return entry
+    return None
+
+
+def log_result(log, message):
+    """Log a message with timestamp to the open log file and stdout."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_entry = f"[{timestamp}] {message}\n"
 
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(log_entry)
+    log.write(log_entry)
 
     print(log_entry.strip())
 
 
-def main():
+def load_cache(cache_file):
+    """Load cached validation results, keeping the newest entry per key."""
+    cache = {}
+    if not cache_file.exists():
+        return cache
+
+    with open(cache_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Skip a partially written line from an interrupted run
+                continue
+            cache[entry["key"]] = entry
+
+    return cache
+
+
+def append_cache(cache_out, key, ok, msg, ts):
+    """Append a single validation result to the open cache file."""
+    entry = {"key": key, "ok": ok, "msg": msg, "ts": ts}
+    cache_out.write(json.dumps(entry) + "\n")
+
+
+def is_cacheable(success, message):
+    """Cache successes and definitive not-found answers, never transient errors."""
+    return (
+        success
+        or "not found" in message
+        or message.endswith(("status: 404", "status: 410"))
+    )
+
+
+async def bounded(sem, validator, session, value):
+    """Run a validator while holding a slot in the concurrency semaphore."""
+    async with sem:
+        return await validator(session, value)
+
+
+async def validate_all(
+    sem, validators, session, work, cache, cache_out, validator="crossref"
+):
+    """Validate (kind, value) work items concurrently, reusing fresh cache entries.
+
+    Each item is dispatched to validators[kind]; validator names the DOI mode
+    so its results are cached separately. Yields (kind, value, success,
+    message) tuples in completion order so results can be reported as soon as
+    each one is ready.
+    """
+
+    async def validate_one(kind, value):
+        key = cache_key(kind, value, validator)
+        entry = cached_result(cache, key)
+        if entry:
+            return kind, value, entry["ok"], f"{entry['msg']} (cached)"
+
+        success, message = await bounded(sem, validators[kind], session, value)
+        if is_cacheable(success, message):
+            append_cache(cache_out, key, success, message, time.time())
+        return kind, value, success, message
+
+    tasks = [validate_one(kind, value) for kind, value in work]
+    for next_result in asyncio.as_completed(tasks):
+        yield await next_result
+
+
+async def amain(log, cache_out, validator="crossref"):
     """Main validation function."""
     bib_file = Path("../reference.bib")
-    log_file = Path("log.txt")
-
-    # Clear previous log
-    if log_file.exists():
-        log_file.unlink()
 
-    log_result(log_file, "=== Reference Validation Started ===")
+    log_result(log, "=== Reference Validation Started ===")
 
     if not bib_file.exists():
-        log_result(log_file, "ERROR: reference.bib not found")
+        log_result(log, "ERROR: reference.bib not found")
         sys.exit(1)
 
     try:
-        entries, dois, urls = parse_bib_file(bib_file)
-        log_result(
-            log_file,
-            f"Found {len(entries)} entries, {len(dois)} DOIs, {len(urls)} URLs",
+        entries, dois, urls, warnings = parse_bib_file(bib_file)
+        for warning in warnings:
+            log_result(log, f"⚠️  WARNING: {warning}")
+        found_counts = (
+            f"Found {len(entries)} entries, {len(dois)} DOIs, {len(urls)} URLs"
         )
 
-        session = setup_session()
-
-        # Validate DOIs
-        log_result(log_file, "\n--- Validating DOIs ---")
-        doi_success = 0
-        for i, doi in enumerate(dois, 1):
-            log_result(log_file, f"Validating DOI {i}/{len(dois)}: {doi}")
-            success, message = validate_doi(session, doi)
-
-            if success:
-                doi_success += 1
-                log_result(log_file, f"✅ {message}")
-            else:
-                log_result(log_file, f"❌ {message}")
-
-            # Rate limiting - longer delay for Crossref API
-            time.sleep(1.0)
+        # DOIs are case-insensitive; drop duplicates while keeping file order
+        dois = list(dict.fromkeys(doi.strip().lower() for doi in dois))
+        urls = list(dict.fromkeys(url.strip() for url in urls))
+        log_result(
+            log,
+            f"{found_counts} ({len(dois)} unique DOIs, {len(urls)} unique URLs)",
+        )
 
-        # Validate URLs
-        log_result(log_file, "\n--- Validating URLs ---")
-        url_success = 0
-        for i, url in enumerate(urls, 1):
-            log_result(log_file, f"Validating URL {i}/{len(urls)}: {url[:80]}...")
-            success, message = validate_url(session, url)
+        cache = load_cache(CACHE_FILE)
+        sem = asyncio.Semaphore(CONCURRENCY)
 
-            if success:
-                url_success += 1
-                log_result(log_file, f"✅ {message}")
+        async with setup_session() as session:
+            if validator == "head":
+                validators = {"doi": validate_doi_direct, "url": validate_url}
             else:
-                log_result(log_file, f"❌ {message}")
-
-            # Rate limiting - longer delay for Crossref API
-            time.sleep(1.0)
+                # Prefetch Crossref records for uncached DOIs in batches
+                pending = [
+                    doi
+                    for doi in dois
+                    if not cached_result(cache, cache_key("doi", doi))
+                ]
+                found, checked = await lookup_crossref(sem, session, pending)
+                validators = {
+                    "doi": partial(validate_doi_batched, found=found, checked=checked),
+                    "url": validate_url,
+                }
+
+            # DOIs and URLs are independent, so validate them in one batch
+            log_result(log, "\n--- Validating DOIs and URLs ---")
+            work = [("doi", doi) for doi in dois] + [("url", url) for url in urls]
+            doi_success = 0
+            url_success = 0
+            i = 0
+            async for kind, value, success, message in validate_all(
+                sem, validators, session, work, cache, cache_out, validator
+            ):
+                i += 1
+                log_result(
+                    log, f"Validated {kind.upper()} {i}/{len(work)}: {value[:80]}"
+                )
+
+                if success:
+                    if kind == "doi":
+                        doi_success += 1
+                    else:
+                        url_success += 1
+                    log_result(log, f"✅ {message}")
+                else:
+                    log_result(log, f"❌ {message}")
 
         # Summary
-        log_result(log_file, "\n=== Validation Summary ===")
-        log_result(log_file, f"DOIs: {doi_success}/{len(dois)} successful")
-        log_result(log_file, f"URLs: {url_success}/{len(urls)} successful")
+        log_result(log, "\n=== Validation Summary ===")
+        log_result(log, f"DOIs: {doi_success}/{len(dois)} successful")
+        log_result(log, f"URLs: {url_success}/{len(urls)} successful")
         log_result(
-            log_file,
+            log,
             f"Total: {doi_success + url_success}/{len(dois) + len(urls)} successful",
         )
 
         if doi_success == len(dois) and url_success == len(urls):
-            log_result(log_file, "🎉 All references validated successfully!")
+            log_result(log, "🎉 All references validated successfully!")
         else:
             log_result(
-                log_file,
+                log,
                 "⚠️  Some references failed validation - review log for details",
             )
 
     except Exception as e:
-        log_result(log_file, f"ERROR: {str(e)}")
+        log_result(log, f"ERROR: {str(e)}")
         sys.exit(1)
 
 
+def main():
+    """Run the async validation pipeline."""
+    parser = argparse.ArgumentParser(description="Validate DOIs and URLs")
+    parser.add_argument(
+        "--validator",
+        choices=("crossref", "head"),
+        default="crossref",
+        help="check DOIs via Crossref (default) or only by a HEAD request to doi.org",
+    )
+    args = parser.parse_args()
+
+    # Open the log (truncating the previous one) and cache once for the whole
+    # run; line buffering keeps progress on disk if the run is interrupted
+    with open("log.txt", "w", encoding="utf-8", buffering=1) as log:
+        with open(CACHE_FILE, "a", encoding="utf-8", buffering=1) as cache_out:
+            asyncio.run(amain(log, cache_out, args.validator))
+
+
 if __name__ == "__main__":
     main()